@@ -14,7 +14,6 @@ import pytest
 from pandas import testing as tm
 
 import cudf
-from cudf._lib.null_mask import bitmask_allocation_size_bytes
 from cudf.core.column.datetime import _numpy_to_pandas_conversion
 from cudf.utils import dtypes as dtypeutils
 
@@ -60,24 +59,47 @@ def random_bitmask(size):
     size : int
         number of bits
     """
-    sz = bitmask_allocation_size_bytes(size)
+    # Matches libcudf's bitmask_allocation_size_bytes: one bit per element,
+    # padded to a multiple of 64 bytes
+    sz = ((size + 7) // 8 + 63) // 64 * 64
     data = np.random.randint(0, 255, dtype="u1", size=sz)
     return data.view("i1")
 
 
 def expand_bits_to_bytes(arr):
-    def fix_binary(bstr):
-        bstr = bstr[2:]
-        diff = 8 - len(bstr)
-        return ("0" * diff + bstr)[::-1]
+    return np.unpackbits(
+        np.frombuffer(arr.data, dtype=np.uint8), bitorder="little"
+    ).tolist()
 
-    ba = bytearray(arr.data)
-    return list(map(int, "".join(map(fix_binary, map(bin, ba)))))
 
+def count_zero(arr, out=None):
+    """Count the zero elements of ``arr``.
 
-def count_zero(arr):
+    ``out`` may be a preallocated boolean array of the same shape as
+    ``arr`` to reuse as scratch space when calling this in a loop.
+    """
     arr = np.asarray(arr)
-    return np.count_nonzero(arr == 0)
+    return np.count_nonzero(np.equal(arr, 0, out=out))
+
+
+def _assert_series_equal(left, right, **kwargs):
+    # TODO: A warning is emitted from the function
+    # pandas.testing.assert_series_equal for some inputs:
+    # "DeprecationWarning: elementwise comparison failed; this will raise
+    # an error in the future."
+    # This warning comes from a call from pandas to numpy. It is ignored
+    # here because it cannot be fixed within cudf.
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", DeprecationWarning)
+        tm.assert_series_equal(left, right, **kwargs)
+
+
+# Comparison functions for pairs of pandas objects of exactly the same type
+_ASSERT_EQ_DISPATCH = {
+    pd.DataFrame: tm.assert_frame_equal,
+    pd.Series: _assert_series_equal,
+    pd.Index: tm.assert_index_equal,
+}
 
 
 def assert_eq(left, right, **kwargs):
@@ -88,6 +110,13 @@ def assert_eq(left, right, **kwargs):
     without switching between assert_frame_equal/assert_series_equal/...
     functions.
     """
+    # Two pandas objects of the same type need neither the cudf dtype check
+    # nor any conversion, so compare them directly
+    assert_fn = _ASSERT_EQ_DISPATCH.get(type(left))
+    if assert_fn is not None and type(right) is type(left):
+        assert_fn(left, right, **kwargs)
+        return True
+
     # dtypes that we support but Pandas doesn't will convert to
     # `object`. Check equality before that happens:
     if kwargs.get("check_dtype", True):
@@ -103,6 +132,13 @@ def assert_eq(left, right, **kwargs):
         left = left.to_pandas()
     if hasattr(right, "to_pandas"):
         right = right.to_pandas()
+    if isinstance(left, cupy.ndarray) and isinstance(right, cupy.ndarray):
+        # Compare on device rather than copying both operands to host
+        if left.dtype.kind == "f" and right.dtype.kind == "f":
+            assert cupy.allclose(left, right, equal_nan=True).item()
+        else:
+            assert cupy.array_equal(left, right).item()
+        return True
     if isinstance(left, cupy.ndarray):
         left = cupy.asnumpy(left)
     if isinstance(right, cupy.ndarray):
@@ -111,22 +147,15 @@ def assert_eq(left, right, **kwargs):
     if isinstance(left, pd.DataFrame):
         tm.assert_frame_equal(left, right, **kwargs)
     elif isinstance(left, pd.Series):
-        # TODO: A warning is emitted from the function
-        # pandas.testing.assert_series_equal for some inputs:
-        # "DeprecationWarning: elementwise comparison failed; this will raise
-        # an error in the future."
-        # This warning comes from a call from pandas to numpy. It is ignored
-        # here because it cannot be fixed within cudf.
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore", DeprecationWarning)
-            tm.assert_series_equal(left, right, **kwargs)
+        _assert_series_equal(left, right, **kwargs)
     elif isinstance(left, pd.Index):
         tm.assert_index_equal(left, right, **kwargs)
     elif isinstance(left, np.ndarray) and isinstance(right, np.ndarray):
         if np.issubdtype(left.dtype, np.floating) and np.issubdtype(
             right.dtype, np.floating
         ):
-            assert np.allclose(left, right, equal_nan=True)
+            if not np.array_equal(left, right, equal_nan=True):
+                assert np.allclose(left, right, equal_nan=True)
         else:
             assert np.array_equal(left, right)
     else:
@@ -265,49 +294,69 @@ def _get_args_kwars_for_assert_exceptions(func_args_and_kwargs):
         return func_args, func_kwargs
 
 
+def _gen_rand_float(dtype, size, **kwargs):
+    res = np.random.random(size=size).astype(dtype)
+    if kwargs.get("positive_only", False):
+        return res
+    else:
+        return res * 2 - 1
+
+
+def _gen_rand_int(default_low, default_high):
+    def gen(dtype, size, **kwargs):
+        low = kwargs.get("low", default_low)
+        high = kwargs.get("high", default_high)
+        return np.random.randint(low=low, high=high, size=size).astype(dtype)
+
+    return gen
+
+
+def _gen_rand_datetime(dtype, size, **kwargs):
+    low = kwargs.get("low", 0)
+    time_unit, _ = np.datetime_data(dtype)
+    high = kwargs.get(
+        "high", 1000000000000000000 / _numpy_to_pandas_conversion[time_unit],
+    )
+    return pd.to_datetime(
+        np.random.randint(low=low, high=high, size=size), unit=time_unit
+    )
+
+
+def _gen_rand_str(dtype, size, **kwargs):
+    return pd.util.testing.rands_array(10, size)
+
+
+# Small integer types use a narrower default range than the rest of their
+# kind, so they are looked up by dtype before falling back to dtype.kind.
+_GEN_RAND_BY_DTYPE = {
+    np.dtype("int8"): _gen_rand_int(-32, 32),
+    np.dtype("int16"): _gen_rand_int(-32, 32),
+    np.dtype("uint8"): _gen_rand_int(0, 32),
+    np.dtype("uint16"): _gen_rand_int(0, 32),
+}
+
+_GEN_RAND_BY_KIND = {
+    "f": _gen_rand_float,
+    "i": _gen_rand_int(-10000, 10000),
+    "u": _gen_rand_int(0, 128),
+    "b": _gen_rand_int(0, 2),
+    "M": _gen_rand_datetime,
+    "O": _gen_rand_str,
+    "U": _gen_rand_str,
+}
+
+
 def gen_rand(dtype, size, **kwargs):
     dtype = cudf.dtype(dtype)
-    if dtype.kind == "f":
-        res = np.random.random(size=size).astype(dtype)
-        if kwargs.get("positive_only", False):
-            return res
-        else:
-            return res * 2 - 1
-    elif dtype == np.int8 or dtype == np.int16:
-        low = kwargs.get("low", -32)
-        high = kwargs.get("high", 32)
-        return np.random.randint(low=low, high=high, size=size).astype(dtype)
-    elif dtype.kind == "i":
-        low = kwargs.get("low", -10000)
-        high = kwargs.get("high", 10000)
-        return np.random.randint(low=low, high=high, size=size).astype(dtype)
-    elif dtype == np.uint8 or dtype == np.uint16:
-        low = kwargs.get("low", 0)
-        high = kwargs.get("high", 32)
-        return np.random.randint(low=low, high=high, size=size).astype(dtype)
-    elif dtype.kind == "u":
-        low = kwargs.get("low", 0)
-        high = kwargs.get("high", 128)
-        return np.random.randint(low=low, high=high, size=size).astype(dtype)
-    elif dtype.kind == "b":
-        low = kwargs.get("low", 0)
-        high = kwargs.get("high", 2)
-        return np.random.randint(low=low, high=high, size=size).astype(
-            np.bool_
-        )
-    elif dtype.kind == "M":
-        low = kwargs.get("low", 0)
-        time_unit, _ = np.datetime_data(dtype)
-        high = kwargs.get(
-            "high",
-            1000000000000000000 / _numpy_to_pandas_conversion[time_unit],
-        )
-        return pd.to_datetime(
-            np.random.randint(low=low, high=high, size=size), unit=time_unit
-        )
-    elif dtype.kind in ("O", "U"):
-        return pd.util.testing.rands_array(10, size)
-    raise NotImplementedError(f"dtype.kind={dtype.kind}")
+    gen = None
+    if isinstance(dtype, np.dtype):
+        # Extension dtypes such as cudf.CategoricalDtype are not hashable
+        gen = _GEN_RAND_BY_DTYPE.get(dtype)
+    if gen is None:
+        gen = _GEN_RAND_BY_KIND.get(dtype.kind)
+    if gen is None:
+        raise NotImplementedError(f"dtype.kind={dtype.kind}")
+    return gen(dtype, size, **kwargs)
 
 
 def gen_rand_series(dtype, size, **kwargs):
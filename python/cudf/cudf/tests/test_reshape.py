@@ -1,5 +1,6 @@
 # Copyright (c) 2021-2022, NVIDIA CORPORATION.
 
+import functools
 import re
 
 import numpy as np
@@ -12,58 +13,100 @@ from cudf.core._compat import PANDAS_GE_120
 from cudf.testing._utils import (
     ALL_TYPES,
     DATETIME_TYPES,
+    FLOAT_TYPES,
     NUMERIC_TYPES,
     assert_eq,
 )
 
 
+def _dtype_nulls_params(dtypes, nulls):
+    # Nulls are only generated for floating point data, so other dtypes are
+    # only paired with nulls="none"
+    return [
+        (dtype, null)
+        for dtype in dtypes
+        for null in nulls
+        if null == "none" or dtype in FLOAT_TYPES
+    ]
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_pdf(num_cols, num_rows, dtype, nulls):
+    # Use a fresh generator with a fixed seed per call rather than one shared
+    # across the module so that the data does not depend on test order or
+    # pytest-xdist scheduling
+    rng = np.random.default_rng(0)
+    # Draw all columns at once as the rows of a single 2-D array
+    data = rng.integers(0, 26, size=(num_cols, num_rows))
+    if dtype != "category":
+        data = data.astype(dtype, copy=False)
+    if nulls == "some":
+        # Null out exactly half of the rows of each column, at random
+        # positions, so that even the smallest inputs mix valid and nulls
+        mask = rng.random(data.shape).argsort(axis=1) < num_rows // 2
+        np.putmask(data, mask, np.nan)
+    elif nulls == "all":
+        data[:] = np.nan
+    pdf = pd.DataFrame({str(i): data[i] for i in range(num_cols)})
+    if dtype == "category":
+        pdf = pdf.astype(dtype)
+    return pdf
+
+
+def _make_pdf(num_cols, num_rows, dtype, nulls):
+    return _cached_pdf(num_cols, num_rows, dtype, nulls).copy(deep=True)
+
+
+@functools.lru_cache(maxsize=None)
+def _make_gdf(num_cols, num_rows, dtype, nulls):
+    # Shared between tests, must not be passed to mutating APIs
+    return cudf.from_pandas(_cached_pdf(num_cols, num_rows, dtype, nulls))
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _clear_reshape_caches():
+    yield
+    # Release the cached frames (and their device memory) once this module
+    # is done rather than holding them for the rest of the worker's run
+    _make_gdf.cache_clear()
+    _cached_pdf.cache_clear()
+
+
 @pytest.mark.parametrize("num_id_vars", [0, 1, 2])
 @pytest.mark.parametrize("num_value_vars", [0, 1, 2])
 @pytest.mark.parametrize("num_rows", [1, 2, 100])
-@pytest.mark.parametrize("dtype", NUMERIC_TYPES + DATETIME_TYPES)
-@pytest.mark.parametrize("nulls", ["none", "some", "all"])
+@pytest.mark.parametrize(
+    "dtype,nulls",
+    _dtype_nulls_params(
+        NUMERIC_TYPES + DATETIME_TYPES, ["none", "some", "all"]
+    ),
+)
 def test_melt(nulls, num_id_vars, num_value_vars, num_rows, dtype):
-    if dtype not in ["float32", "float64"] and nulls in ["some", "all"]:
-        pytest.skip(msg="nulls not supported in dtype: " + dtype)
-
-    pdf = pd.DataFrame()
-    id_vars = []
-    for i in range(num_id_vars):
-        colname = "id" + str(i)
-        data = np.random.randint(0, 26, num_rows).astype(dtype)
-        if nulls == "some":
-            idx = np.random.choice(
-                num_rows, size=int(num_rows / 2), replace=False
-            )
-            data[idx] = np.nan
-        elif nulls == "all":
-            data[:] = np.nan
-        pdf[colname] = data
-        id_vars.append(colname)
-
-    value_vars = []
-    for i in range(num_value_vars):
-        colname = "val" + str(i)
-        data = np.random.randint(0, 26, num_rows).astype(dtype)
-        if nulls == "some":
-            idx = np.random.choice(
-                num_rows, size=int(num_rows / 2), replace=False
-            )
-            data[idx] = np.nan
-        elif nulls == "all":
-            data[:] = np.nan
-        pdf[colname] = data
-        value_vars.append(colname)
-
-    gdf = cudf.from_pandas(pdf)
+    num_cols = num_id_vars + num_value_vars
+    pdf = _make_pdf(num_cols, num_rows, dtype, nulls)
+    gdf = _make_gdf(num_cols, num_rows, dtype, nulls)
+    id_vars = list(pdf.columns[:num_id_vars])
+    value_vars = list(pdf.columns[num_id_vars:])
 
     got = cudf_melt(frame=gdf, id_vars=id_vars, value_vars=value_vars)
     got_from_melt_method = gdf.melt(id_vars=id_vars, value_vars=value_vars)
 
-    expect = pd.melt(frame=pdf, id_vars=id_vars, value_vars=value_vars)
-    # pandas' melt makes the 'variable' column of 'object' type (string)
-    # cuDF's melt makes it Categorical because it doesn't support strings
-    expect["variable"] = expect["variable"].astype("category")
+    # Build the expected result directly rather than through pd.melt: id
+    # columns are tiled once per value column and value columns are stacked
+    # end to end. cuDF's melt makes the 'variable' column Categorical
+    # because it doesn't support strings
+    expect = pd.DataFrame(
+        {
+            **{
+                col: np.tile(pdf[col].to_numpy(), num_value_vars)
+                for col in id_vars
+            },
+            "variable": pd.Categorical(
+                np.repeat(np.array(value_vars, dtype=object), num_rows)
+            ),
+            "value": pdf[value_vars].to_numpy().ravel("F"),
+        }
+    )
 
     assert_eq(expect, got)
 
@@ -73,34 +116,21 @@ def test_melt(nulls, num_id_vars, num_value_vars, num_rows, dtype):
 @pytest.mark.parametrize("num_cols", [1, 2, 10])
 @pytest.mark.parametrize("num_rows", [1, 2, 1000])
 @pytest.mark.parametrize(
-    "dtype",
-    list(NUMERIC_TYPES + DATETIME_TYPES)
+    "dtype,nulls",
+    _dtype_nulls_params(NUMERIC_TYPES + DATETIME_TYPES, ["none", "some"])
     + [
         pytest.param(
             "str",
+            "none",
             marks=pytest.mark.xfail(
                 condition=not PANDAS_GE_120, reason="pandas bug"
             ),
         )
     ],
 )
-@pytest.mark.parametrize("nulls", ["none", "some"])
 def test_df_stack(nulls, num_cols, num_rows, dtype):
-    if dtype not in ["float32", "float64"] and nulls in ["some"]:
-        pytest.skip(msg="nulls not supported in dtype: " + dtype)
-
-    pdf = pd.DataFrame()
-    for i in range(num_cols):
-        colname = str(i)
-        data = np.random.randint(0, 26, num_rows).astype(dtype)
-        if nulls == "some":
-            idx = np.random.choice(
-                num_rows, size=int(num_rows / 2), replace=False
-            )
-            data[idx] = np.nan
-        pdf[colname] = data
-
-    gdf = cudf.from_pandas(pdf)
+    pdf = _make_pdf(num_cols, num_rows, dtype, nulls)
+    gdf = _make_gdf(num_cols, num_rows, dtype, nulls)
 
     got = gdf.stack()
     expect = pdf.stack()
@@ -133,27 +163,14 @@ def test_df_stack_reset_index():
 @pytest.mark.parametrize("num_rows", [1, 2, 10, 1000])
 @pytest.mark.parametrize("num_cols", [1, 2, 10])
 @pytest.mark.parametrize(
-    "dtype", NUMERIC_TYPES + DATETIME_TYPES + ["category"]
+    "dtype,nulls",
+    _dtype_nulls_params(
+        NUMERIC_TYPES + DATETIME_TYPES + ["str", "category"], ["none", "some"],
+    ),
 )
-@pytest.mark.parametrize("nulls", ["none", "some"])
 def test_interleave_columns(nulls, num_cols, num_rows, dtype):
-
-    if dtype not in ["float32", "float64"] and nulls in ["some"]:
-        pytest.skip(msg="nulls not supported in dtype: " + dtype)
-
-    pdf = pd.DataFrame(dtype=dtype)
-    for i in range(num_cols):
-        colname = str(i)
-        data = pd.Series(np.random.randint(0, 26, num_rows)).astype(dtype)
-
-        if nulls == "some":
-            idx = np.random.choice(
-                num_rows, size=int(num_rows / 2), replace=False
-            )
-            data[idx] = np.nan
-        pdf[colname] = data
-
-    gdf = cudf.from_pandas(pdf)
+    pdf = _make_pdf(num_cols, num_rows, dtype, nulls)
+    gdf = _make_gdf(num_cols, num_rows, dtype, nulls)
 
     if dtype == "category":
         with pytest.raises(ValueError):
@@ -171,28 +188,12 @@ def test_interleave_columns(nulls, num_cols, num_rows, dtype):
 @pytest.mark.parametrize("num_cols", [1, 2, 10])
 @pytest.mark.parametrize("num_rows", [1, 2, 1000])
 @pytest.mark.parametrize("count", [1, 2, 10])
-@pytest.mark.parametrize("dtype", ALL_TYPES)
-@pytest.mark.parametrize("nulls", ["none", "some"])
+@pytest.mark.parametrize(
+    "dtype,nulls", _dtype_nulls_params(ALL_TYPES, ["none", "some"])
+)
 def test_tile(nulls, num_cols, num_rows, dtype, count):
-
-    if dtype not in ["float32", "float64"] and nulls in ["some"]:
-        pytest.skip(msg="nulls not supported in dtype: " + dtype)
-
-    pdf = pd.DataFrame(dtype=dtype)
-    for i in range(num_cols):
-        colname = str(i)
-        data = pd.Series(np.random.randint(num_cols, 26, num_rows)).astype(
-            dtype
-        )
-
-        if nulls == "some":
-            idx = np.random.choice(
-                num_rows, size=int(num_rows / 2), replace=False
-            )
-            data[idx] = np.nan
-        pdf[colname] = data
-
-    gdf = cudf.from_pandas(pdf)
+    pdf = _make_pdf(num_cols, num_rows, dtype, nulls)
+    gdf = _make_gdf(num_cols, num_rows, dtype, nulls)
 
     got = gdf.tile(count)
     expect = pd.DataFrame(pd.concat([pdf] * count))
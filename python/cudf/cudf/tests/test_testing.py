@@ -1,5 +1,6 @@
 # Copyright (c) 2020, NVIDIA CORPORATION.
 
+import cupy
 import numpy as np
 import pandas as pd
 import pytest
@@ -369,3 +370,29 @@ def test_basic_scalar_equality(left, right):
 def test_basic_scalar_inequality(left, right):
     with pytest.raises(AssertionError, match=r".*not (almost )?equal.*"):
         assert_eq(left, right)
+
+
+@pytest.mark.parametrize(
+    "left, right",
+    [
+        (np.array([1, 2, 3]), np.array([1, 2, 3])),
+        (np.array([1.0, np.nan, 3.0]), np.array([1.0, np.nan, 3.0])),
+        (np.array([1, 2, 3]), np.array([1.0, 2.0, 3.0])),
+    ],
+)
+def test_cupy_array_equality(left, right):
+    assert_eq(cupy.asarray(left), cupy.asarray(right))
+
+
+@pytest.mark.parametrize(
+    "left, right",
+    [
+        (np.array([1, 2, 3]), np.array([1, 2, 4])),
+        (np.array([1.0, np.nan, 3.0]), np.array([1.0, 2.0, 3.0])),
+        (np.array([1.0, 2.0, 3.0]), np.array([1.0, 2.0, 3.5])),
+        (np.array([1, 2, 3]), np.array([1.0, 2.0, 3.5])),
+    ],
+)
+def test_cupy_array_inequality(left, right):
+    with pytest.raises(AssertionError):
+        assert_eq(cupy.asarray(left), cupy.asarray(right))